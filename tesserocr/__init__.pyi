@@ -848,6 +848,111 @@ def iterate_level(iterator: PyPageIterator, level: RIL):
     ...
 
 
+class ResultTable:
+    """Columns of one level of :class:`BinaryResults`.
+
+    Each column named in :class:`BinaryResults` is available as an attribute
+    holding a :class:`memoryview` into the source buffer.
+    """
+
+    name: str
+    size: int
+
+    def __getattr__(self, name: str) -> memoryview:
+        """Return column `name`, e.g. ``bbox``, ``conf`` or ``text_start``."""
+        ...
+
+    def __len__(self) -> int: ...
+
+    def text(self, index: int) -> str:
+        """Return the decoded text of row `index` (words, symbols and fonts only).
+
+        Raises:
+            :exc:`TypeError`: If the table has no text.
+        """
+        ...
+
+
+class BinaryResults:
+    """Zero-copy reader of buffers produced by :meth:`PyTessBaseAPI.GetBinaryResults`.
+
+    The buffer holds the result hierarchy as flat columns (one array per attribute
+    and level) which are exposed as :class:`memoryview` objects without copying or
+    building per-element Python objects. Views support the buffer protocol, e.g.
+    ``numpy.asarray(results.words.conf)``.
+
+    >>> results = BinaryResults(api.GetBinaryResults())
+    >>> words = results.words
+    >>> for i in range(len(words)):
+    ...     print(words.text(i), words.conf[i], words.bbox[4 * i:4 * i + 4].tolist())
+
+    Layout (version 1, little-endian). A 36 byte header ``<4sHHIIIIIII``: magic
+    ``b'TSRB'``, version, flags (``0x1``: symbols included), then the number of
+    blocks, paragraphs, lines, words, symbols and fonts and the size of the text
+    area. It is followed by the columns below, in order, each a flat array of 4 byte
+    items (``i``: int32, ``I``: uint32, ``f``: float32) with one row per element
+    (four consecutive items for ``[4]`` columns), and finally the UTF-8 text area:
+
+        blocks: bbox (i[4]: left, top, right, bottom), conf (f), block_type (i, see :class:`PT`),
+            para_start (I, n + 1)
+        paragraphs: bbox (i[4]), conf (f), justification (i, see :class:`Justification`),
+            first_line_indent (i), flags (I: ``PARA_*``), line_start (I, n + 1)
+        lines: bbox (i[4]), conf (f), baseline (i[4]: x1, y1, x2, y2), word_start (I, n + 1)
+        words: bbox (i[4]), conf (f), flags (I: ``WORD_*``), pointsize (i),
+            font (i, index into fonts or -1), text_start (I, n + 1),
+            symbol_start (I, n + 1, only with symbols)
+        symbols (only with symbols): bbox (i[4]), conf (f), flags (I: ``SYMBOL_*``),
+            text_start (I, n + 1)
+        fonts: text_start (I, n + 1)
+
+    ``*_start`` columns hold one more row than their level: children of parent ``i``
+    are rows ``start[i]:start[i + 1]`` of the child level, and the text of row ``i``
+    is ``text[text_start[i]:text_start[i + 1]]``. Box and baseline columns are flat,
+    row ``i`` is ``bbox[4 * i:4 * i + 4]`` (e.g. ``numpy.asarray(words.bbox).reshape(-1, 4)``).
+    Only blocks containing text are included. On big-endian hosts the columns are
+    converted (copied) on load.
+
+    Args:
+        buffer: ``bytes`` or any object supporting the buffer protocol.
+
+    Raises:
+        :exc:`ValueError`: If the buffer is not a valid results buffer.
+    """
+
+    PARA_LTR = 0x1
+    PARA_LIST_ITEM = 0x2
+    PARA_CROWN = 0x4
+
+    WORD_BOLD = 0x1
+    WORD_ITALIC = 0x2
+    WORD_UNDERLINED = 0x4
+    WORD_MONOSPACE = 0x8
+    WORD_SERIF = 0x10
+    WORD_SMALLCAPS = 0x20
+    WORD_FROM_DICTIONARY = 0x40
+    WORD_NUMERIC = 0x80
+
+    SYMBOL_SUPERSCRIPT = 0x1
+    SYMBOL_SUBSCRIPT = 0x2
+    SYMBOL_DROPCAP = 0x4
+
+    flags: int
+    has_symbols: bool
+    text: memoryview
+    blocks: ResultTable
+    paragraphs: ResultTable
+    lines: ResultTable
+    words: ResultTable
+    symbols: ResultTable
+    fonts: ResultTable
+
+    def __init__(self, buffer: typing.Union[bytes, bytearray, memoryview]) -> None: ...
+
+    def font_name(self, index: int) -> typing.Optional[str]:
+        """Return the font name of a word's `font` index or ``None`` if it's -1."""
+        ...
+
+
 class PyTessBaseAPI:
     """Cython wrapper class around the C++ TessBaseAPI class.
 
@@ -1557,6 +1662,26 @@ class PyTessBaseAPI:
         """
         ...
 
+    def GetBinaryResults(self, symbols: bool = False) -> bytes:
+        """Return the complete result hierarchy as a compact binary buffer.
+
+        Blocks, paragraphs, lines, words and optionally symbols are collected
+        with their bounding boxes, confidences, baselines, font attributes and
+        text in a single pass over the result iterator, without creating
+        per-element Python objects. Use :class:`BinaryResults` to read the
+        buffer (see its docstring for the layout).
+
+        Kwargs:
+            symbols (bool): Include symbol (character) level results. Defaults to ``False``.
+
+        Returns:
+            bytes: Serialized results.
+
+        Raises:
+            :exc:`RuntimeError`: If recognition fails.
+        """
+        ...
+
     def DetectOrientationScript(self) -> dict:
         """Detect the orientation of the input image and apparent script (alphabet).
 
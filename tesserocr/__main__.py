@@ -0,0 +1,630 @@
+"""Batch OCR command-line entry point.
+
+Run ``python -m tesserocr --help`` for usage. Inputs may be image files,
+directories (scanned for image files) or glob patterns; a list of inputs can
+also be read from a file (one path per line, ``-`` for stdin).
+
+Pages are recognized by a pool of worker threads, each one owning a reused
+:class:`PyTessBaseAPI` instance (tesseract releases the GIL while
+recognizing). Results are written per input next to it or under
+``--output-dir`` (mirroring the inputs' paths below their common directory),
+or as a single JSONL stream with ``--combined``::
+
+    $ python -m tesserocr scans/ -o out/ -f hocr -j 4 --resume
+    $ python -m tesserocr --file-list inputs.txt --combined results.jsonl --manifest done.jsonl
+"""
+
+import argparse
+import glob
+import html
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from . import PSM, OEM, PyTessBaseAPI, get_languages
+
+try:
+    from PIL import Image, ImageSequence
+except ImportError:
+    # multi-page inputs will be limited to their first page
+    Image = None
+
+
+_LOGGER = logging.getLogger("tesserocr")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".gif", ".pnm", ".pbm", ".pgm",
+                    ".ppm", ".jp2", ".webp")
+
+FORMATS = {
+    "text": ".txt",
+    "hocr": ".hocr",
+    "tsv": ".tsv",
+    "jsonl": ".jsonl",
+}
+
+_HOCR_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"
+    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">
+ <head>
+  <title>{title}</title>
+  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>
+  <meta name='ocr-system' content='tesseract {version}'/>
+  <meta name='ocr-capabilities' content='ocr_page ocr_carea ocr_par ocr_line ocrx_word ocrp_wconf'/>
+ </head>
+ <body>
+"""
+_HOCR_FOOTER = """ </body>
+</html>
+"""
+_TSV_HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+
+
+def _is_glob(pattern):
+    return any(c in pattern for c in "*?[")
+
+
+def _list_dir(path, recursive, extensions):
+    if recursive:
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    yield os.path.join(root, name)
+    else:
+        for name in sorted(os.listdir(path)):
+            full = os.path.join(path, name)
+            if name.lower().endswith(extensions) and os.path.isfile(full):
+                yield full
+
+
+def _glob_root(pattern):
+    """Return the leading part of `pattern` without glob magic."""
+    parts = []
+    for part in os.path.normpath(pattern).split(os.sep):
+        if _is_glob(part):
+            break
+        parts.append(part)
+    if len(parts) == 1 and os.path.isabs(pattern):
+        # only the anchor is left, e.g. "/*.png"
+        return parts[0] + os.sep
+    return os.sep.join(parts) or os.curdir
+
+
+def collect_inputs(paths, recursive=False, extensions=IMAGE_EXTENSIONS, missing=None):
+    """Expand paths, directories and glob patterns into a list of input files.
+
+    Args:
+        paths (iterable): File paths, directories or glob patterns.
+        recursive (bool): Descend into sub-directories of directory inputs.
+        extensions (tuple): Lower-case file extensions accepted when scanning directories.
+        missing (list): If given, paths that don't exist and patterns that match no
+            files are appended to it.
+
+    Returns:
+        list: ``(path, root)`` tuples, where `root` is the directory output paths
+            are made relative to: the common path of all directory arguments, glob
+            prefixes and file locations, so distinct inputs keep distinct relative
+            paths. Duplicates are dropped, order is preserved.
+
+    Raises:
+        :exc:`ValueError`: If the inputs have no common path (e.g. different drives).
+    """
+    inputs = []
+    roots = set()
+    seen = set()
+
+    def add(path):
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            inputs.append(path)
+
+    for path in paths:
+        if os.path.isdir(path):
+            roots.add(os.path.abspath(path))
+            for f in _list_dir(path, recursive, extensions):
+                add(f)
+        elif _is_glob(path):
+            matches = sorted(glob.glob(path, recursive=True))
+            if not matches:
+                _LOGGER.warning("No files match pattern: %s", path)
+                if missing is not None:
+                    missing.append(path)
+            roots.add(os.path.abspath(_glob_root(path)))
+            for f in matches:
+                if os.path.isfile(f):
+                    add(f)
+        elif os.path.isfile(path):
+            roots.add(os.path.dirname(os.path.abspath(path)))
+            add(path)
+        else:
+            _LOGGER.warning("Input not found: %s", path)
+            if missing is not None:
+                missing.append(path)
+    if not inputs:
+        return []
+    root = os.path.commonpath(sorted(roots))
+    return [(path, root) for path in inputs]
+
+
+def read_file_list(filename):
+    """Read input paths from `filename` (one per line, ``-`` for stdin), skipping blanks and ``#`` comments."""
+    if filename == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(filename, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def output_path(path, root, output_dir, fmt, keep_extension=False):
+    """Return the output file path of input `path` for format `fmt`.
+
+    With `keep_extension`, the source extension is kept (``a.png`` -> ``a.png.txt``).
+    """
+    base = path if keep_extension else os.path.splitext(path)[0]
+    if output_dir:
+        base = os.path.join(output_dir, os.path.relpath(os.path.abspath(base), root or os.curdir))
+    return base + FORMATS[fmt]
+
+
+def assign_outputs(inputs, output_dir, fmt):
+    """Return the output path of each ``(path, root)`` in `inputs`.
+
+    Inputs that would share an output path (e.g. ``a.png`` and ``a.jpg``) keep
+    their source extension in the output name.
+
+    Raises:
+        :exc:`ValueError`: If output paths still collide.
+    """
+    outputs = [output_path(path, root, output_dir, fmt) for path, root in inputs]
+    counts = {}
+    for out in outputs:
+        key = os.path.normcase(os.path.abspath(out))
+        counts[key] = counts.get(key, 0) + 1
+    for i, (path, root) in enumerate(inputs):
+        if counts[os.path.normcase(os.path.abspath(outputs[i]))] > 1:
+            outputs[i] = output_path(path, root, output_dir, fmt, keep_extension=True)
+    seen = {}
+    for (path, _), out in zip(inputs, outputs):
+        key = os.path.normcase(os.path.abspath(out))
+        if key in seen:
+            raise ValueError(f"{seen[key]} and {path} would both be written to {out}")
+        seen[key] = path
+    return outputs
+
+
+def _source_stat(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class Manifest:
+    """Append-only JSONL record of completed inputs, keyed by absolute path.
+
+    An input is considered done when an entry exists whose size and modification
+    time match the current file.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(filename):
+            with open(filename, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._entries[entry["source"]] = entry
+                    except (ValueError, KeyError):
+                        # a truncated last line from an interrupted run
+                        continue
+        self._file = open(filename, "a", encoding="utf-8")
+
+    def is_done(self, path):
+        entry = self._entries.get(os.path.abspath(path))
+        if entry is None:
+            return False
+        try:
+            stat = _source_stat(path)
+        except OSError:
+            return False
+        return entry.get("size") == stat["size"] and entry.get("mtime_ns") == stat["mtime_ns"]
+
+    def add(self, path, pages, output=None):
+        entry = {"source": os.path.abspath(path), "pages": pages, "output": output}
+        entry.update(_source_stat(path))
+        with self._lock:
+            self._entries[entry["source"]] = entry
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class Stats:
+    """Thread-safe page throughput and latency counters.
+
+    Progress updates report percentiles over the last `window` pages, the
+    final summary over all pages.
+    """
+
+    def __init__(self, total_inputs, window=1024):
+        self.total_inputs = total_inputs
+        self.inputs = 0
+        self.skipped = 0
+        self.failed = 0
+        self.latencies = array("d")
+        self.recent = deque(maxlen=window)
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_page(self, elapsed):
+        with self._lock:
+            self.latencies.append(elapsed)
+            self.recent.append(elapsed)
+
+    def add_input(self, failed=False):
+        with self._lock:
+            self.inputs += 1
+            if failed:
+                self.failed += 1
+
+    @staticmethod
+    def percentile(values, pct):
+        """Return the nearest-rank percentile `pct` (0-100) of sorted `values`."""
+        if not values:
+            return 0.0
+        k = max(0, math.ceil(pct / 100.0 * len(values)) - 1)
+        return values[min(k, len(values) - 1)]
+
+    def snapshot(self, final=False):
+        with self._lock:
+            latencies = sorted(self.latencies if final else self.recent)
+            pages = len(self.latencies)
+            inputs = self.inputs
+            failed = self.failed
+        elapsed = time.perf_counter() - self.started
+        return {
+            "inputs": inputs,
+            "total": self.total_inputs,
+            "skipped": self.skipped,
+            "failed": failed,
+            "pages": pages,
+            "elapsed": elapsed,
+            "pages_per_sec": pages / elapsed if elapsed > 0 else 0.0,
+            "p50": self.percentile(latencies, 50),
+            "p95": self.percentile(latencies, 95),
+        }
+
+    def status_line(self):
+        s = self.snapshot()
+        return ("[{inputs}/{total}] {pages} pages, {pages_per_sec:.2f} pages/s, "
+                "p50 {p50:.3f}s, p95 {p95:.3f}s, {failed} failed".format(**s))
+
+    def summary(self):
+        s = self.snapshot(final=True)
+        return ("Processed {inputs} inputs ({skipped} skipped, {failed} failed), {pages} pages "
+                "in {elapsed:.2f}s: {pages_per_sec:.2f} pages/s, "
+                "latency p50 {p50:.3f}s, p95 {p95:.3f}s".format(**s))
+
+
+class Worker:
+    """OCR inputs with per-thread, reused :class:`PyTessBaseAPI` instances."""
+
+    def __init__(self, fmt, stats, path=None, lang=None, psm=PSM.AUTO, oem=OEM.DEFAULT, variables=None):
+        self.fmt = fmt
+        self.stats = stats
+        self._api_kwargs = {"psm": psm, "oem": oem, "variables": variables}
+        if path is not None:
+            self._api_kwargs["path"] = path
+        if lang is not None:
+            self._api_kwargs["lang"] = lang
+        self._local = threading.local()
+        self._apis = []
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Initialize the first engine up front so setup errors surface before any input.
+
+        Raises:
+            :exc:`RuntimeError`: If the engine fails to initialize.
+        """
+        api = PyTessBaseAPI(**self._api_kwargs)
+        with self._lock:
+            self._apis.append(api)
+            self._idle.append(api)
+
+    def _get_api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            with self._lock:
+                api = self._idle.pop() if self._idle else None
+            if api is None:
+                api = PyTessBaseAPI(**self._api_kwargs)
+                with self._lock:
+                    self._apis.append(api)
+            self._local.api = api
+        return api
+
+    def close(self):
+        with self._lock:
+            for api in self._apis:
+                api.End()
+            del self._apis[:]
+
+    def _pages(self, path):
+        """Yield ``(page_index, image)`` for each page; `image` is ``None`` for single-page files."""
+        image = None
+        if Image is not None:
+            try:
+                image = Image.open(path)
+            except OSError:
+                # not readable by Pillow, let leptonica try
+                pass
+        if image is not None:
+            with image:
+                if getattr(image, "n_frames", 1) > 1:
+                    for i, frame in enumerate(ImageSequence.Iterator(image)):
+                        yield i, frame
+                    return
+        yield 0, None
+
+    def _recognize_page(self, api, path, page, image):
+        if image is None:
+            api.SetImageFile(path)
+        else:
+            api.SetImage(image)
+        if self.fmt == "hocr":
+            return api.GetHOCRText(page)
+        if self.fmt == "tsv":
+            return api.GetTSVText(page)
+        text = api.GetUTF8Text()
+        if self.fmt == "jsonl":
+            return {
+                "source": os.path.abspath(path),
+                "page": page,
+                "text": text,
+                "confidence": api.MeanTextConf(),
+            }
+        return text
+
+    def process(self, path):
+        """Recognize all pages of `path`.
+
+        Returns:
+            list: One result per page; strings for text/hocr/tsv, dicts for jsonl.
+        """
+        api = self._get_api()
+        results = []
+        for page, image in self._pages(path):
+            start = time.perf_counter()
+            result = self._recognize_page(api, path, page, image)
+            elapsed = time.perf_counter() - start
+            if isinstance(result, dict):
+                result["elapsed"] = round(elapsed, 6)
+            results.append(result)
+            self.stats.add_page(elapsed)
+        return results
+
+
+def format_output(results, fmt, title=""):
+    """Join per-page `results` of one input into the file content for `fmt`."""
+    if fmt == "jsonl":
+        return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in results)
+    if fmt == "hocr":
+        return (_HOCR_HEADER.format(title=html.escape(title), version=PyTessBaseAPI.Version()) + "".join(results) +
+                _HOCR_FOOTER)
+    if fmt == "tsv":
+        return _TSV_HEADER + "".join(results)
+    return "\f".join(results)
+
+
+def _write_atomic(filename, content):
+    dirname = os.path.dirname(filename)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    tmp = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp, filename)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _done_in_combined(filename):
+    done = set()
+    if os.path.exists(filename):
+        with open(filename, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(os.path.abspath(json.loads(line)["source"]))
+                except (ValueError, KeyError):
+                    continue
+    return done
+
+
+def _parse_variables(values):
+    variables = {}
+    for value in values or ():
+        name, sep, val = value.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {value!r}")
+        variables[name] = val
+    return variables
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m tesserocr",
+        description="Batch OCR of image files, directories and glob patterns.")
+    parser.add_argument("inputs", nargs="*", help="image files, directories or glob patterns")
+    parser.add_argument("-L", "--file-list", action="append", default=[],
+                        help="read input paths from FILE, one per line ('-' for stdin)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="descend into sub-directories")
+    parser.add_argument("--extensions", default=",".join(e.lstrip(".") for e in IMAGE_EXTENSIONS),
+                        help="comma separated image extensions to pick from directories (default: %(default)s)")
+    parser.add_argument("-f", "--format", choices=sorted(FORMATS), help="output format (default: text)")
+    parser.add_argument("-o", "--output-dir", help="write outputs under this directory (default: next to inputs)")
+    parser.add_argument("--combined", metavar="FILE",
+                        help="write all results as one JSONL stream to FILE ('-' for stdout) instead of per-input files")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip inputs whose outputs already exist (or are recorded in --combined FILE)")
+    parser.add_argument("--manifest", metavar="FILE",
+                        help="JSONL manifest of completed inputs; unchanged inputs listed in it are skipped")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of worker threads, each with its own engine (default: %(default)s)")
+    parser.add_argument("-l", "--lang", help="language(s), e.g. eng or eng+deu")
+    parser.add_argument("--tessdata", help="tessdata path")
+    parser.add_argument("--psm", type=int, default=PSM.AUTO, help="page segmentation mode (default: %(default)s)")
+    parser.add_argument("--oem", type=int, default=OEM.DEFAULT, help="OCR engine mode (default: %(default)s)")
+    parser.add_argument("-c", "--config", dest="variables", action="append", metavar="NAME=VALUE",
+                        help="set a tesseract variable (may be repeated)")
+    parser.add_argument("--progress-interval", type=float, default=1.0,
+                        help="seconds between progress updates on stderr, 0 to disable (default: %(default)s)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="don't print progress or summary")
+    parser.add_argument("--list-langs", action="store_true", help="print available languages and exit")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list_langs:
+        path, langs = get_languages(args.tessdata) if args.tessdata else get_languages()
+        print(path)
+        print("\n".join(langs))
+        return 0
+
+    try:
+        variables = _parse_variables(args.variables)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.combined and args.format not in (None, "jsonl"):
+        parser.error("--combined always writes jsonl, it cannot be used with -f {}".format(args.format))
+    if args.format == "tsv" and not hasattr(PyTessBaseAPI, "GetTSVText"):
+        parser.error("tsv output requires tesseract >= 4")
+
+    paths = list(args.inputs)
+    for file_list in args.file_list:
+        paths.extend(read_file_list(file_list))
+    if not paths:
+        parser.error("no inputs given")
+    extensions = tuple("." + e.strip().lower().lstrip(".") for e in args.extensions.split(",") if e.strip())
+    fmt = "jsonl" if args.combined else args.format or "text"
+    missing = []
+    try:
+        inputs = collect_inputs(paths, args.recursive, extensions, missing)
+        outputs = [None] * len(inputs) if args.combined else assign_outputs(inputs, args.output_dir, fmt)
+    except ValueError as e:
+        parser.error(f"conflicting inputs: {e}")
+    if not inputs:
+        parser.error("no input files found")
+    manifest = Manifest(args.manifest) if args.manifest else None
+    done_combined = _done_in_combined(args.combined) if args.resume and args.combined not in (None, "-") else set()
+
+    pending = []
+    for (path, _), out in zip(inputs, outputs):
+        if manifest is not None and manifest.is_done(path):
+            continue
+        if args.resume and (os.path.abspath(path) in done_combined or (out and os.path.exists(out))):
+            continue
+        pending.append((path, out))
+
+    stats = Stats(len(pending))
+    stats.skipped = len(inputs) - len(pending)
+    # unresolved inputs are reported as failures so that typos in file lists are not missed
+    stats.failed = len(missing)
+    worker = Worker(fmt, stats, path=args.tessdata, lang=args.lang, psm=args.psm, oem=args.oem,
+                    variables=variables)
+    try:
+        worker.start()
+    except RuntimeError as e:
+        parser.error(str(e))
+    if args.combined == "-":
+        combined = sys.stdout
+    elif args.combined:
+        combined = open(args.combined, "a" if args.resume or manifest is not None else "w", encoding="utf-8")
+    else:
+        combined = None
+    progress = not args.quiet and args.progress_interval > 0
+    # redraw a single status line on terminals, log one line per update otherwise
+    progress_end = "\r" if sys.stderr.isatty() else "\n"
+    last_report = time.perf_counter()
+
+    def finish(path, out, future):
+        try:
+            results = future.result()
+            if combined is not None:
+                combined.write(format_output(results, fmt))
+                combined.flush()
+            else:
+                _write_atomic(out, format_output(results, fmt, title=os.path.basename(path)))
+            if manifest is not None:
+                manifest.add(path, len(results), out)
+        except Exception as e:
+            _LOGGER.error("Failed to process %s: %s", path, e)
+            stats.add_input(failed=True)
+        else:
+            stats.add_input()
+
+    executor = ThreadPoolExecutor(max_workers=args.jobs)
+    # keep a bounded number of inputs in flight instead of submitting all of them
+    window = args.jobs * 4
+    queued = iter(pending)
+    try:
+        futures = {}
+        while True:
+            for path, out in queued:
+                futures[executor.submit(worker.process, path)] = (path, out)
+                if len(futures) >= window:
+                    break
+            if not futures:
+                break
+            # time out on the progress interval so long multi-page inputs keep the status line live
+            done, _ = wait(futures, timeout=args.progress_interval if progress else None,
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(*futures.pop(future), future)
+            now = time.perf_counter()
+            if progress and now - last_report >= args.progress_interval:
+                last_report = now
+                sys.stderr.write(stats.status_line() + progress_end)
+                sys.stderr.flush()
+    except KeyboardInterrupt:
+        _LOGGER.warning("Interrupted, re-run with --resume or --manifest to continue")
+        return 130
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        worker.close()
+        if combined is not None and combined is not sys.stdout:
+            combined.close()
+        if manifest is not None:
+            manifest.close()
+        if progress and progress_end == "\r":
+            sys.stderr.write("\n")
+        if not args.quiet:
+            sys.stderr.write(stats.summary() + "\n")
+
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(format="%(levelname)s: %(message)s")
+    sys.exit(main())
@@ -21,7 +21,10 @@ tesseract 3.04.00
 __version__ = '2.10.0'
 
 import os
+import sys
+import struct
 import logging
+from array import array
 from io import BytesIO
 from os.path import abspath, join
 try:
@@ -35,8 +38,13 @@ IF TESSERACT_MAJOR_VERSION < 5:
 ELSE:
     from .tesseract5 cimport *
 from libc.stdlib cimport malloc, free
+from libc.string cimport memcpy
+from libc.stdint cimport int32_t, uint32_t
+from libcpp.map cimport map
 from libcpp.pair cimport pair
+from libcpp.string cimport string
 from libcpp.vector cimport vector
+from cpython.bytes cimport PyBytes_FromStringAndSize, PyBytes_AS_STRING
 from cython.operator cimport preincrement as inc, dereference as deref
 from cpython.version cimport PY_MAJOR_VERSION
 from cysignals.signals cimport sig_on, sig_off
@@ -1183,6 +1191,226 @@ def iterate_level(iterator, PageIteratorLevel level):
         yield iterator
 
 
+# Binary results layout, see :class:`BinaryResults`.
+_RESULTS_MAGIC = b'TSRB'
+_RESULTS_VERSION = 1
+_RESULTS_SYMBOLS = 0x1
+_RESULTS_HEADER = struct.Struct('<4sHHIIIIIII')
+# (table, column, typecode, width, extra rows); offset columns have one extra row
+_RESULTS_LAYOUT = (
+    ('blocks', 'bbox', 'i', 4, 0),
+    ('blocks', 'conf', 'f', 1, 0),
+    ('blocks', 'block_type', 'i', 1, 0),
+    ('blocks', 'para_start', 'I', 1, 1),
+    ('paragraphs', 'bbox', 'i', 4, 0),
+    ('paragraphs', 'conf', 'f', 1, 0),
+    ('paragraphs', 'justification', 'i', 1, 0),
+    ('paragraphs', 'first_line_indent', 'i', 1, 0),
+    ('paragraphs', 'flags', 'I', 1, 0),
+    ('paragraphs', 'line_start', 'I', 1, 1),
+    ('lines', 'bbox', 'i', 4, 0),
+    ('lines', 'conf', 'f', 1, 0),
+    ('lines', 'baseline', 'i', 4, 0),
+    ('lines', 'word_start', 'I', 1, 1),
+    ('words', 'bbox', 'i', 4, 0),
+    ('words', 'conf', 'f', 1, 0),
+    ('words', 'flags', 'I', 1, 0),
+    ('words', 'pointsize', 'i', 1, 0),
+    ('words', 'font', 'i', 1, 0),
+    ('words', 'text_start', 'I', 1, 1),
+    ('words', 'symbol_start', 'I', 1, 1),
+    ('symbols', 'bbox', 'i', 4, 0),
+    ('symbols', 'conf', 'f', 1, 0),
+    ('symbols', 'flags', 'I', 1, 0),
+    ('symbols', 'text_start', 'I', 1, 1),
+    ('fonts', 'text_start', 'I', 1, 1),
+)
+_RESULTS_TABLES = ('blocks', 'paragraphs', 'lines', 'words', 'symbols', 'fonts')
+
+
+class ResultTable:
+    """Columns of one level of :class:`BinaryResults`.
+
+    Each column named in :class:`BinaryResults` is available as an attribute
+    holding a :class:`memoryview` into the source buffer.
+    """
+
+    def __init__(self, name, size, text):
+        self.name = name
+        self.size = size
+        self._text = text
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f'<ResultTable {self.name}: {self.size} rows>'
+
+    def text(self, index):
+        """Return the decoded text of row `index` (words, symbols and fonts only).
+
+        Raises:
+            :exc:`TypeError`: If the table has no text.
+        """
+        start = getattr(self, 'text_start', None)
+        if start is None:
+            raise TypeError(f'{self.name} have no text')
+        return bytes(self._text[start[index]:start[index + 1]]).decode('utf-8')
+
+
+class BinaryResults:
+    """Zero-copy reader of buffers produced by :meth:`PyTessBaseAPI.GetBinaryResults`.
+
+    The buffer holds the result hierarchy as flat columns (one array per attribute
+    and level) which are exposed as :class:`memoryview` objects without copying or
+    building per-element Python objects. Views support the buffer protocol, e.g.
+    ``numpy.asarray(results.words.conf)``.
+
+    >>> results = BinaryResults(api.GetBinaryResults())
+    >>> words = results.words
+    >>> for i in range(len(words)):
+    ...     print(words.text(i), words.conf[i], words.bbox[4 * i:4 * i + 4].tolist())
+
+    Layout (version 1, little-endian). A 36 byte header ``<4sHHIIIIIII``: magic
+    ``b'TSRB'``, version, flags (``0x1``: symbols included), then the number of
+    blocks, paragraphs, lines, words, symbols and fonts and the size of the text
+    area. It is followed by the columns below, in order, each a flat array of 4 byte
+    items (``i``: int32, ``I``: uint32, ``f``: float32) with one row per element
+    (four consecutive items for ``[4]`` columns), and finally the UTF-8 text area:
+
+        blocks: bbox (i[4]: left, top, right, bottom), conf (f), block_type (i, see :class:`PT`),
+            para_start (I, n + 1)
+        paragraphs: bbox (i[4]), conf (f), justification (i, see :class:`Justification`),
+            first_line_indent (i), flags (I: ``PARA_*``), line_start (I, n + 1)
+        lines: bbox (i[4]), conf (f), baseline (i[4]: x1, y1, x2, y2), word_start (I, n + 1)
+        words: bbox (i[4]), conf (f), flags (I: ``WORD_*``), pointsize (i),
+            font (i, index into fonts or -1), text_start (I, n + 1),
+            symbol_start (I, n + 1, only with symbols)
+        symbols (only with symbols): bbox (i[4]), conf (f), flags (I: ``SYMBOL_*``),
+            text_start (I, n + 1)
+        fonts: text_start (I, n + 1)
+
+    ``*_start`` columns hold one more row than their level: children of parent ``i``
+    are rows ``start[i]:start[i + 1]`` of the child level, and the text of row ``i``
+    is ``text[text_start[i]:text_start[i + 1]]``. Box and baseline columns are flat,
+    row ``i`` is ``bbox[4 * i:4 * i + 4]`` (e.g. ``numpy.asarray(words.bbox).reshape(-1, 4)``).
+    Only blocks containing text are included. On big-endian hosts the columns are
+    converted (copied) on load.
+
+    Args:
+        buffer: ``bytes`` or any object supporting the buffer protocol.
+
+    Raises:
+        :exc:`ValueError`: If the buffer is not a valid results buffer.
+    """
+
+    PARA_LTR = 0x1
+    PARA_LIST_ITEM = 0x2
+    PARA_CROWN = 0x4
+
+    WORD_BOLD = 0x1
+    WORD_ITALIC = 0x2
+    WORD_UNDERLINED = 0x4
+    WORD_MONOSPACE = 0x8
+    WORD_SERIF = 0x10
+    WORD_SMALLCAPS = 0x20
+    WORD_FROM_DICTIONARY = 0x40
+    WORD_NUMERIC = 0x80
+
+    SYMBOL_SUPERSCRIPT = 0x1
+    SYMBOL_SUBSCRIPT = 0x2
+    SYMBOL_DROPCAP = 0x4
+
+    def __init__(self, buffer):
+        mv = memoryview(buffer).cast('B')
+        if len(mv) < _RESULTS_HEADER.size:
+            raise ValueError('Buffer too small for binary results header')
+        magic, version, flags, *counts, text_size = _RESULTS_HEADER.unpack_from(mv)
+        if magic != _RESULTS_MAGIC:
+            raise ValueError(f'Invalid binary results magic: {magic!r}')
+        if version != _RESULTS_VERSION:
+            raise ValueError(f'Unsupported binary results version: {version}')
+        self.flags = flags
+        self.has_symbols = (flags & _RESULTS_SYMBOLS) != 0
+        swap = sys.byteorder == 'big'
+        sizes = dict(zip(_RESULTS_TABLES, counts))
+        offset = _RESULTS_HEADER.size
+        columns = []
+        for table, column, typecode, width, extra in _RESULTS_LAYOUT:
+            if not self.has_symbols and (table == 'symbols' or column == 'symbol_start'):
+                continue
+            rows = sizes[table] + extra
+            nbytes = rows * width * 4
+            if offset + nbytes > len(mv):
+                raise ValueError('Truncated binary results buffer')
+            view = mv[offset:offset + nbytes]
+            if swap:
+                converted = array(typecode, view.tobytes())
+                converted.byteswap()
+                view = memoryview(converted).cast('B')
+            view = view.cast(typecode)
+            columns.append((table, column, view))
+            offset += nbytes
+        if offset + text_size != len(mv):
+            raise ValueError('Binary results buffer size mismatch')
+        self.text = mv[offset:]
+        for table in _RESULTS_TABLES:
+            setattr(self, table, ResultTable(table, sizes[table], self.text))
+        for table, column, view in columns:
+            setattr(getattr(self, table), column, view)
+
+    def __repr__(self):
+        return '<BinaryResults {}>'.format(
+            ', '.join(f'{table}={len(getattr(self, table))}' for table in _RESULTS_TABLES))
+
+    def font_name(self, index):
+        """Return the font name of a word's `font` index or ``None`` if it's -1."""
+        if index < 0:
+            return None
+        return self.fonts.text(index)
+
+
+cdef inline void _push_box(vector[int32_t] *v, PageIterator *piter, PageIteratorLevel level) noexcept nogil:
+    cdef int left = 0, top = 0, right = 0, bottom = 0
+    piter.BoundingBox(level, 0, &left, &top, &right, &bottom)
+    v.push_back(left)
+    v.push_back(top)
+    v.push_back(right)
+    v.push_back(bottom)
+
+
+cdef inline uint32_t _push_text(string *text, char *s) noexcept nogil:
+    """Append and free `s`, return the start offset of the appended text."""
+    cdef uint32_t start = text.size()
+    if s != NULL:
+        text.append(s)
+        free(s)
+    return start
+
+
+cdef inline char *_put(char *dest, const void *src, size_t nbytes) noexcept nogil:
+    if nbytes:
+        memcpy(dest, src, nbytes)
+    return dest + nbytes
+
+
+cdef inline char *_put32(char *dest, const void *src, size_t count, bool swap) noexcept nogil:
+    """Copy `count` 4 byte items, converting them to little-endian if `swap`."""
+    cdef:
+        size_t i
+        char c
+    _put(dest, src, count * 4)
+    if swap:
+        for i in range(0, count * 4, 4):
+            c = dest[i]
+            dest[i] = dest[i + 3]
+            dest[i + 3] = c
+            c = dest[i + 1]
+            dest[i + 1] = dest[i + 2]
+            dest[i + 2] = c
+    return dest + count * 4
+
+
 cdef class PyTessBaseAPI:
     """Cython wrapper class around the C++ TessBaseAPI class.
 
@@ -2472,6 +2700,198 @@ cdef class PyTessBaseAPI:
                     raise RuntimeError('Failed to recognize. No image set?')
         return _free_str(text)
 
+    def GetBinaryResults(self, bool symbols=False):
+        """Return the complete result hierarchy as a compact binary buffer.
+
+        Blocks, paragraphs, lines, words and optionally symbols are collected
+        with their bounding boxes, confidences, baselines, font attributes and
+        text in a single pass over the result iterator, without creating
+        per-element Python objects. Use :class:`BinaryResults` to read the
+        buffer (see its docstring for the layout).
+
+        Kwargs:
+            symbols (bool): Include symbol (character) level results. Defaults to ``False``.
+
+        Returns:
+            bytes: Serialized results.
+
+        Raises:
+            :exc:`RuntimeError`: If recognition fails.
+        """
+        cdef:
+            ResultIterator *it
+            PageIterator *piter
+            int res = 0
+            int x1, y1, x2, y2
+            TessParagraphJustification justification
+            bool is_list_item, is_crown
+            int first_line_indent
+            bool is_bold, is_italic, is_underlined, is_monospace, is_serif, is_smallcaps
+            int pointsize, font_id, font
+            cchar_t *font_name
+            uint32_t flags, base
+            size_t i, total
+            vector[int32_t] b_box, b_type, p_box, p_just, p_indent, l_box, l_baseline
+            vector[int32_t] w_box, w_size, w_font, s_box
+            vector[float] b_conf, p_conf, l_conf, w_conf, s_conf
+            vector[uint32_t] b_para, p_flags, p_line, l_word
+            vector[uint32_t] w_flags, w_text, w_symbol, s_flags, s_text, f_text
+            vector[string] fonts
+            map[int, int] font_index
+            map[int, int].iterator font_it
+            bool swap = sys.byteorder == 'big'
+            string word_text, symbol_text, font_text
+            char *dest
+            bytes header, buf
+        with nogil:
+            it = self._baseapi.GetIterator()
+            if it == NULL:
+                sig_on()
+                res = self._baseapi.Recognize(NULL)
+                sig_off()
+                if res == 0:
+                    it = self._baseapi.GetIterator()
+            if it == NULL:
+                with gil:
+                    raise RuntimeError('Failed to recognize. No image set?')
+            piter = <PageIterator *>it
+            try:
+                while not it.Empty(RIL_BLOCK):
+                    if it.Empty(RIL_WORD):
+                        it.Next(RIL_WORD)
+                        continue
+                    if it.IsAtBeginningOf(RIL_BLOCK):
+                        _push_box(&b_box, piter, RIL_BLOCK)
+                        b_conf.push_back(it.Confidence(RIL_BLOCK))
+                        b_type.push_back(it.BlockType())
+                        b_para.push_back(p_conf.size())
+                    if it.IsAtBeginningOf(RIL_PARA):
+                        _push_box(&p_box, piter, RIL_PARA)
+                        p_conf.push_back(it.Confidence(RIL_PARA))
+                        it.ParagraphInfo(&justification, &is_list_item, &is_crown, &first_line_indent)
+                        p_just.push_back(justification)
+                        p_indent.push_back(first_line_indent)
+                        p_flags.push_back(<uint32_t>it.ParagraphIsLtr() | <uint32_t>is_list_item << 1 |
+                                          <uint32_t>is_crown << 2)
+                        p_line.push_back(l_conf.size())
+                    if it.IsAtBeginningOf(RIL_TEXTLINE):
+                        _push_box(&l_box, piter, RIL_TEXTLINE)
+                        l_conf.push_back(it.Confidence(RIL_TEXTLINE))
+                        x1 = y1 = x2 = y2 = 0
+                        it.Baseline(RIL_TEXTLINE, &x1, &y1, &x2, &y2)
+                        l_baseline.push_back(x1)
+                        l_baseline.push_back(y1)
+                        l_baseline.push_back(x2)
+                        l_baseline.push_back(y2)
+                        l_word.push_back(w_conf.size())
+
+                    _push_box(&w_box, piter, RIL_WORD)
+                    w_conf.push_back(it.Confidence(RIL_WORD))
+                    is_bold = is_italic = is_underlined = is_monospace = is_serif = is_smallcaps = False
+                    pointsize = font_id = 0
+                    font_name = it.WordFontAttributes(&is_bold, &is_italic, &is_underlined, &is_monospace,
+                                                      &is_serif, &is_smallcaps, &pointsize, &font_id)
+                    font = -1
+                    if font_name != NULL:
+                        font_it = font_index.find(font_id)
+                        if font_it == font_index.end():
+                            font = fonts.size()
+                            font_index[font_id] = font
+                            fonts.push_back(string(font_name))
+                        else:
+                            font = deref(font_it).second
+                    flags = (<uint32_t>is_bold | <uint32_t>is_italic << 1 | <uint32_t>is_underlined << 2 |
+                             <uint32_t>is_monospace << 3 | <uint32_t>is_serif << 4 |
+                             <uint32_t>is_smallcaps << 5 | <uint32_t>it.WordIsFromDictionary() << 6 |
+                             <uint32_t>it.WordIsNumeric() << 7)
+                    w_flags.push_back(flags)
+                    w_size.push_back(pointsize)
+                    w_font.push_back(font)
+                    w_text.push_back(_push_text(&word_text, it.GetUTF8Text(RIL_WORD)))
+
+                    if not symbols:
+                        it.Next(RIL_WORD)
+                        continue
+                    w_symbol.push_back(s_conf.size())
+                    while True:
+                        _push_box(&s_box, piter, RIL_SYMBOL)
+                        s_conf.push_back(it.Confidence(RIL_SYMBOL))
+                        s_flags.push_back(<uint32_t>it.SymbolIsSuperscript() |
+                                          <uint32_t>it.SymbolIsSubscript() << 1 |
+                                          <uint32_t>it.SymbolIsDropcap() << 2)
+                        s_text.push_back(_push_text(&symbol_text, it.GetUTF8Text(RIL_SYMBOL)))
+                        it.Next(RIL_SYMBOL)
+                        if it.Empty(RIL_BLOCK) or it.IsAtBeginningOf(RIL_WORD):
+                            break
+            finally:
+                del it
+            self._destroy_pix()
+
+            # close offset columns and rebase text offsets on the shared text area
+            b_para.push_back(p_conf.size())
+            p_line.push_back(l_conf.size())
+            l_word.push_back(w_conf.size())
+            w_text.push_back(word_text.size())
+            base = word_text.size()
+            if symbols:
+                w_symbol.push_back(s_conf.size())
+                s_text.push_back(symbol_text.size())
+                for i in range(s_text.size()):
+                    s_text[i] += base
+                base += symbol_text.size()
+            for i in range(fonts.size()):
+                f_text.push_back(base + font_text.size())
+                font_text.append(fonts[i])
+            f_text.push_back(base + font_text.size())
+
+        header = _RESULTS_HEADER.pack(
+            _RESULTS_MAGIC, _RESULTS_VERSION,
+            _RESULTS_SYMBOLS if symbols else 0,
+            b_conf.size(), p_conf.size(), l_conf.size(), w_conf.size(), s_conf.size(), fonts.size(),
+            word_text.size() + symbol_text.size() + font_text.size())
+        total = (len(header) + 4 * (
+            b_box.size() + b_conf.size() + b_type.size() + b_para.size() +
+            p_box.size() + p_conf.size() + p_just.size() + p_indent.size() + p_flags.size() + p_line.size() +
+            l_box.size() + l_conf.size() + l_baseline.size() + l_word.size() +
+            w_box.size() + w_conf.size() + w_flags.size() + w_size.size() + w_font.size() + w_text.size() +
+            w_symbol.size() + s_box.size() + s_conf.size() + s_flags.size() + s_text.size() + f_text.size()) +
+            word_text.size() + symbol_text.size() + font_text.size())
+        buf = PyBytes_FromStringAndSize(NULL, total)
+        dest = PyBytes_AS_STRING(buf)
+        dest = _put(dest, <char *>header, len(header))
+        # column order must match _RESULTS_LAYOUT
+        with nogil:
+            dest = _put32(dest, b_box.data(), b_box.size(), swap)
+            dest = _put32(dest, b_conf.data(), b_conf.size(), swap)
+            dest = _put32(dest, b_type.data(), b_type.size(), swap)
+            dest = _put32(dest, b_para.data(), b_para.size(), swap)
+            dest = _put32(dest, p_box.data(), p_box.size(), swap)
+            dest = _put32(dest, p_conf.data(), p_conf.size(), swap)
+            dest = _put32(dest, p_just.data(), p_just.size(), swap)
+            dest = _put32(dest, p_indent.data(), p_indent.size(), swap)
+            dest = _put32(dest, p_flags.data(), p_flags.size(), swap)
+            dest = _put32(dest, p_line.data(), p_line.size(), swap)
+            dest = _put32(dest, l_box.data(), l_box.size(), swap)
+            dest = _put32(dest, l_conf.data(), l_conf.size(), swap)
+            dest = _put32(dest, l_baseline.data(), l_baseline.size(), swap)
+            dest = _put32(dest, l_word.data(), l_word.size(), swap)
+            dest = _put32(dest, w_box.data(), w_box.size(), swap)
+            dest = _put32(dest, w_conf.data(), w_conf.size(), swap)
+            dest = _put32(dest, w_flags.data(), w_flags.size(), swap)
+            dest = _put32(dest, w_size.data(), w_size.size(), swap)
+            dest = _put32(dest, w_font.data(), w_font.size(), swap)
+            dest = _put32(dest, w_text.data(), w_text.size(), swap)
+            dest = _put32(dest, w_symbol.data(), w_symbol.size(), swap)
+            dest = _put32(dest, s_box.data(), s_box.size(), swap)
+            dest = _put32(dest, s_conf.data(), s_conf.size(), swap)
+            dest = _put32(dest, s_flags.data(), s_flags.size(), swap)
+            dest = _put32(dest, s_text.data(), s_text.size(), swap)
+            dest = _put32(dest, f_text.data(), f_text.size(), swap)
+            dest = _put(dest, word_text.data(), word_text.size())
+            dest = _put(dest, symbol_text.data(), symbol_text.size())
+            dest = _put(dest, font_text.data(), font_text.size())
+        return buf
+
     IF TESSERACT_VERSION >= 0x3999800:
         def DetectOrientationScript(self):
             """Detect the orientation of the input image and apparent script (alphabet).
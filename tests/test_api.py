@@ -341,6 +341,85 @@ class TestTessBaseApi(unittest.TestCase):
         res = self._api.Recognize()
         self.assertTrue(res)
 
+    def test_binary_results(self):
+        """Test GetBinaryResults and reading it back with BinaryResults."""
+        self._api.SetImageFile(self._image_file)
+        self._api.Recognize()
+        words = self._api.AllWords()
+        results = tesserocr.BinaryResults(self._api.GetBinaryResults())
+        self.assertFalse(results.has_symbols)
+        self.assertEqual([results.words.text(i) for i in range(len(results.words))], words)
+        self.assertEqual(len(results.words.bbox), 4 * len(words))
+        self.assertTrue(all(0 <= conf <= 100 for conf in results.words.conf.tolist()))
+        self.assertRaises(TypeError, results.lines.text, 0)
+        # children ranges chain through all levels
+        self.assertEqual(results.blocks.para_start[-1], len(results.paragraphs))
+        self.assertEqual(results.paragraphs.line_start[-1], len(results.lines))
+        self.assertEqual(results.lines.word_start[-1], len(results.words))
+
+        # words: boxes, font attributes and flags
+        for i, it in enumerate(tesserocr.iterate_level(self._api.GetIterator(), tesserocr.RIL.WORD)):
+            self.assertEqual(tuple(results.words.bbox[4 * i:4 * i + 4].tolist()), it.BoundingBox(tesserocr.RIL.WORD))
+            attrs = it.WordFontAttributes()
+            font = results.words.font[i]
+            self.assertGreaterEqual(font, -1)
+            self.assertLess(font, len(results.fonts))
+            self.assertEqual(results.font_name(font) or "", attrs["font_name"])
+            flags = results.words.flags[i]
+            if attrs["font_name"]:
+                self.assertEqual(results.words.pointsize[i], attrs["pointsize"])
+                self.assertEqual(bool(flags & results.WORD_BOLD), attrs["bold"])
+                self.assertEqual(bool(flags & results.WORD_ITALIC), attrs["italic"])
+            self.assertEqual(bool(flags & results.WORD_FROM_DICTIONARY), it.WordIsFromDictionary())
+            self.assertEqual(bool(flags & results.WORD_NUMERIC), it.WordIsNumeric())
+        self.assertIsNone(results.font_name(-1))
+
+        # lines: baselines
+        for i, it in enumerate(tesserocr.iterate_level(self._api.GetIterator(), tesserocr.RIL.TEXTLINE)):
+            baseline = it.Baseline(tesserocr.RIL.TEXTLINE)
+            expected = [c for point in baseline for c in point] if baseline else [0, 0, 0, 0]
+            self.assertEqual(results.lines.baseline[4 * i:4 * i + 4].tolist(), expected)
+
+        # paragraphs: justification, indent and flags
+        for i, it in enumerate(tesserocr.iterate_level(self._api.GetIterator(), tesserocr.RIL.PARA)):
+            justification, is_list_item, is_crown, first_line_indent = it.ParagraphInfo()
+            self.assertEqual(results.paragraphs.justification[i], justification)
+            self.assertEqual(results.paragraphs.first_line_indent[i], first_line_indent)
+            flags = results.paragraphs.flags[i]
+            self.assertEqual(bool(flags & results.PARA_LTR), it.ParagraphIsLtr())
+            self.assertEqual(bool(flags & results.PARA_LIST_ITEM), is_list_item)
+            self.assertEqual(bool(flags & results.PARA_CROWN), is_crown)
+
+        payload = self._api.GetBinaryResults(symbols=True)
+        results = tesserocr.BinaryResults(payload)
+        self.assertTrue(results.has_symbols)
+        self.assertEqual(results.words.symbol_start[-1], len(results.symbols))
+        first = "".join(results.symbols.text(i) for i in range(results.words.symbol_start[0],
+                                                                results.words.symbol_start[1]))
+        self.assertEqual(first, words[0])
+
+        # reader errors: too short, wrong magic, wrong version
+        self.assertRaises(ValueError, tesserocr.BinaryResults, b"TSRB")
+        self.assertRaises(ValueError, tesserocr.BinaryResults, b"XXXX" + payload[4:])
+        self.assertRaises(ValueError, tesserocr.BinaryResults, payload[:4] + b"\x63\x00" + payload[6:])
+        self.assertRaises(ValueError, tesserocr.BinaryResults, payload[:-1])
+
+    @unittest.skipIf(not pil_installed, "Pillow not installed")
+    def test_binary_results_empty(self):
+        """Test GetBinaryResults on a blank image."""
+        self._api.SetImage(Image.new("L", (200, 100), 255))
+        self._api.Recognize()
+        results = tesserocr.BinaryResults(self._api.GetBinaryResults(symbols=True))
+        for table in (results.blocks, results.paragraphs, results.lines, results.words,
+                      results.symbols, results.fonts):
+            self.assertEqual(len(table), 0)
+        for column in (results.blocks.para_start, results.paragraphs.line_start, results.lines.word_start,
+                       results.words.text_start, results.words.symbol_start, results.symbols.text_start,
+                       results.fonts.text_start):
+            self.assertEqual(column.tolist(), [0])
+        self.assertEqual(len(results.words.bbox), 0)
+        self.assertEqual(len(results.text), 0)
+
     @unittest.skipIf(_TESSERACT_VERSION < 0x3040100, "tesseract < 4")
     def test_row_attributes(self):
         self._api.SetImageFile(self._image_file)
@@ -0,0 +1,112 @@
+import json
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from tesserocr.__main__ import Stats, _glob_root, assign_outputs, collect_inputs, main, output_path
+
+
+class TestBatchCli(unittest.TestCase):
+
+    _test_dir = os.path.abspath(os.path.dirname(__file__))
+    _image_file = os.path.join(_test_dir, "eurotext.png")
+
+    def setUp(self):
+        self._tmp = tempfile.mkdtemp()
+        self._in = os.path.join(self._tmp, "in")
+        self._out = os.path.join(self._tmp, "out")
+        os.makedirs(os.path.join(self._in, "sub"))
+        shutil.copy(self._image_file, os.path.join(self._in, "a.png"))
+        shutil.copy(self._image_file, os.path.join(self._in, "sub", "b.png"))
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp)
+
+    def test_collect_inputs(self):
+        """Test directory, recursive and glob input expansion."""
+        self.assertEqual([p for p, _ in collect_inputs([self._in])], [os.path.join(self._in, "a.png")])
+        inputs = collect_inputs([self._in, os.path.join(self._in, "**", "*.png")], recursive=True)
+        self.assertEqual(len(inputs), 2)
+        path, root = inputs[1]
+        self.assertEqual(output_path(path, root, self._out, "hocr"), os.path.join(self._out, "sub", "b.hocr"))
+
+    def test_assign_outputs(self):
+        """Test output paths keep inputs from different directories and extensions apart."""
+        os.makedirs(os.path.join(self._in, "other"))
+        shutil.copy(self._image_file, os.path.join(self._in, "other", "b.png"))
+        shutil.copy(self._image_file, os.path.join(self._in, "sub", "b.jpg"))
+        pattern = os.path.join(self._in, "*", "b.*")
+        inputs = collect_inputs([pattern])
+        outputs = assign_outputs(inputs, self._out, "text")
+        self.assertEqual(sorted(os.path.relpath(out, self._out) for out in outputs),
+                         [os.path.join("other", "b.txt"), os.path.join("sub", "b.jpg.txt"),
+                          os.path.join("sub", "b.png.txt")])
+
+    def test_combined_format_conflict(self):
+        with self.assertRaises(SystemExit):
+            main([self._in, "--combined", os.path.join(self._tmp, "out.jsonl"), "-f", "hocr", "-q"])
+
+    def test_glob_root(self):
+        self.assertEqual(_glob_root(os.path.join(self._in, "*", "*.png")), self._in)
+        self.assertEqual(_glob_root("*.png"), os.curdir)
+        self.assertEqual(_glob_root(os.path.join(os.sep, "*.png")), os.sep)
+
+    def test_missing_inputs(self):
+        """Test unresolved inputs fail the run."""
+        missing = os.path.join(self._tmp, "missing.png")
+        with self.assertRaises(SystemExit):
+            main([missing, "-q"])
+        self.assertEqual(main([missing, os.path.join(self._in, "a.png"), "-o", self._out, "-q"]), 1)
+        self.assertTrue(os.path.exists(os.path.join(self._out, "a.txt")))
+
+    def test_invalid_lang(self):
+        with self.assertRaises(SystemExit):
+            main([self._in, "-l", "invalid_language", "-q"])
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(Stats.percentile(values, 50), 50)
+        self.assertEqual(Stats.percentile(values, 95), 95)
+        self.assertEqual(Stats.percentile([], 95), 0.0)
+
+    def test_text_output_and_resume(self):
+        """Test per-input text outputs are written and skipped with --resume."""
+        args = [self._in, "-r", "-o", self._out, "-j", "2", "-q"]
+        self.assertEqual(main(args), 0)
+        out = os.path.join(self._out, "sub", "b.txt")
+        with open(out) as f:
+            self.assertIn("quick", f.read())
+        mtime = os.path.getmtime(out)
+        self.assertEqual(main(args + ["--resume"]), 0)
+        self.assertEqual(os.path.getmtime(out), mtime)
+
+    def test_combined_manifest(self):
+        """Test combined JSONL output and manifest based skipping."""
+        combined = os.path.join(self._tmp, "results.jsonl")
+        manifest = os.path.join(self._tmp, "manifest.jsonl")
+        args = [self._in, "-r", "--combined", combined, "--manifest", manifest, "-q"]
+        self.assertEqual(main(args), 0)
+        with open(combined) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 2)
+        self.assertIn("quick", records[0]["text"])
+        self.assertEqual(records[0]["source"], os.path.abspath(records[0]["source"]))
+        self.assertGreater(records[0]["confidence"], 0)
+        # unchanged inputs are skipped and the existing stream is appended to
+        self.assertEqual(main(args), 0)
+        with open(combined) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        # resuming with a differently spelled path doesn't duplicate records
+        cwd = os.getcwd()
+        os.chdir(self._in)
+        try:
+            self.assertEqual(main([os.curdir, "-r", "--combined", combined, "--resume", "-q"]), 0)
+        finally:
+            os.chdir(cwd)
+        with open(combined) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()